@@ -10,11 +10,18 @@ Installation:
 
 import numpy as np
 from stl import mesh
+import matplotlib
+# Headless backend, selected before pyplot import: this is a CLI tool, and
+# choosing Agg up front keeps pyplot from probing for an interactive GUI
+# backend at import time.
+matplotlib.use('Agg')
 import matplotlib.pyplot as plt
-from matplotlib.collections import PolyCollection
+from matplotlib.collections import PathCollection
+from matplotlib.path import Path
 import argparse
 import os
 import sys
+from functools import lru_cache
 from glob import glob
 
 try:
@@ -24,9 +31,626 @@ except ImportError:
     trimesh = None
     Image = None
 
+try:
+    import numba
+except ImportError:
+    numba = None
+
+
+def _make_light_dir(elevation_deg, azimuth_deg):
+    """Unit light-direction vector from elevation/azimuth in degrees."""
+    el, az = np.radians(elevation_deg), np.radians(azimuth_deg)
+    d = np.array([
+        np.cos(el) * np.sin(az),
+        np.cos(el) * np.cos(az),
+        np.sin(el),
+    ])
+    return d / np.linalg.norm(d)
+
+
+# Light from upper-left at 45° elevation — identical for every render,
+# so compute it once at import instead of per file in batch mode.
+_LIGHT_DIR = _make_light_dir(45, 225)
+
+# Flat-shading model shared by both renderers
+_AMBIENT = 0.3
+_BASE_COLOR = np.array([0.7, 0.7, 0.75], dtype=np.float32)
+
+# Exact sin/cos for 90-degree rotation stops (avoids floating-point noise)
+_EXACT_ROTATIONS = {
+    0:   (1.0,  0.0),
+    90:  (0.0,  1.0),
+    180: (-1.0, 0.0),
+    270: (0.0, -1.0),
+}
+
+
+@lru_cache(maxsize=8)
+def _z_rot_sin_cos(rotation):
+    """(cos, sin) for a Z-axis rotation in degrees, memoized across a batch."""
+    key = rotation % 360
+    if key in _EXACT_ROTATIONS:
+        return _EXACT_ROTATIONS[key]
+    angle_rad = np.radians(rotation)
+    return float(np.cos(angle_rad)), float(np.sin(angle_rad))
+
+
+def _rotate_xy_inplace(arr, rotation):
+    """
+    Rotate the XY components of (..., 3) coordinates about Z, in place.
+
+    The CLI's 90° stops are pure swap/negate permutations: 180° needs no
+    scratch at all and 90°/270° a single scratch column, instead of the
+    two full column copies of the general cos/sin form. Arbitrary angles
+    also get by with one saved column.
+    """
+    key = rotation % 360
+    if key == 0:
+        return
+    x = arr[..., 0]
+    y = arr[..., 1]
+    if key == 90:       # (x, y) -> (-y, x)
+        tmp = x.copy()
+        np.negative(y, out=x)
+        y[...] = tmp
+    elif key == 180:    # (x, y) -> (-x, -y)
+        np.negative(x, out=x)
+        np.negative(y, out=y)
+    elif key == 270:    # (x, y) -> (y, -x)
+        tmp = x.copy()
+        x[...] = y
+        np.negative(tmp, out=y)
+    else:
+        cos_a, sin_a = _z_rot_sin_cos(rotation)
+        tmp = x.copy()
+        np.multiply(x, cos_a, out=x)
+        x -= sin_a * y
+        np.multiply(y, cos_a, out=y)
+        y += sin_a * tmp
+
+
+def _face_normals(vectors):
+    """
+    Unit face normals recomputed from vertex winding.
+
+    STL files frequently carry stale or zero normal records; deriving
+    normals from the vertices guarantees correct shading and replaces the
+    copy + normalize passes both renderers used to run on the stored ones.
+    Degenerate faces get a zero normal (clamped divisor) rather than NaN.
+    """
+    edge1 = vectors[:, 1] - vectors[:, 0]
+    edge2 = vectors[:, 2] - vectors[:, 0]
+    n = np.cross(edge1, edge2)
+    n /= np.linalg.norm(n, axis=1, keepdims=True).clip(1e-12)
+    return n
+
+
+class _MeshData:
+    """
+    Lightweight stand-in for stl.mesh.Mesh built from raw arrays.
+
+    Exposes just what the renderers use — vectors, normals and lazily
+    computed min_/max_ bounds — without numpy-stl's structured-array
+    assembly.
+    """
+    __slots__ = ('vectors', 'normals', '_min', '_max')
+
+    def __init__(self, vectors, normals):
+        self.vectors = vectors
+        self.normals = normals
+        self._min = None
+        self._max = None
+
+    @property
+    def min_(self):
+        if self._min is None:
+            self._min = self.vectors.reshape(-1, 3).min(axis=0)
+        return self._min
+
+    @property
+    def max_(self):
+        if self._max is None:
+            self._max = self.vectors.reshape(-1, 3).max(axis=0)
+        return self._max
+
+
+# Binary STL triangle record: normal, three vertices, 2 pad bytes (50 bytes)
+_STL_RECORD = np.dtype([
+    ('normal', '<f4', (3,)),
+    ('v', '<f4', (3, 3)),
+    ('pad', '<u2'),
+])
+
+
+@lru_cache(maxsize=64)
+def _load_stl_cached(path, mtime):
+    """
+    Parse an STL once per (path, mtime) and keep the raw arrays.
+
+    Binary STL is a fixed-record format (80-byte header, uint32 count,
+    50 bytes per triangle), so one np.frombuffer with a struct dtype
+    reads the whole file at memory speed instead of going through
+    numpy-stl's record assembly. Files whose header starts with "solid"
+    may be ASCII and fall back to mesh.Mesh.from_file, which sniffs the
+    real format itself. The mtime key invalidates the entry when the
+    file changes.
+    """
+    with open(path, 'rb') as f:
+        header = f.read(80)
+        if len(header) == 80 and not header.startswith(b'solid'):
+            count = int.from_bytes(f.read(4), 'little')
+            recs = np.frombuffer(f.read(), dtype=_STL_RECORD, count=count)
+            return recs['v'].copy(), recs['normal'].copy()
+
+    m = mesh.Mesh.from_file(path)
+    return np.asarray(m.vectors, dtype=np.float32), np.asarray(m.normals, dtype=np.float32)
+
+
+def _load_mesh(path):
+    """
+    Load an STL as _MeshData, via the parse cache.
+
+    Returns fresh copies of the cached arrays: the renderers rotate
+    vertices and normals in place, which must not corrupt the cache.
+    """
+    vectors, normals = _load_stl_cached(path, os.path.getmtime(path))
+    return _MeshData(vectors.copy(), normals.copy())
+
+
+def _maybe_decimate(stl_mesh, max_dimension, decimate_ratio=None):
+    """
+    Decimate oversized meshes before rendering at small pixel sizes.
+
+    With more triangles than output pixels most faces rasterize to less
+    than a pixel, so rendering cost can be bounded by simplifying first.
+    By default kicks in only when the face count exceeds 4 * max_dimension²;
+    an explicit decimate_ratio (0 < ratio < 1) forces that reduction instead.
+    Returns the mesh unchanged if decimation is unnecessary or unavailable
+    (requires trimesh plus its fast_simplification backend); an explicitly
+    requested ratio that cannot be honored warns on stderr rather than
+    silently rendering the full mesh.
+    """
+    if trimesh is None:
+        if decimate_ratio is not None:
+            print("Warning: --decimate-ratio requires trimesh; "
+                  "rendering the full mesh", file=sys.stderr)
+        return stl_mesh
+
+    num_faces = len(stl_mesh.vectors)
+    if decimate_ratio is not None:
+        if decimate_ratio >= 1.0:
+            return stl_mesh
+        target = max(4, int(num_faces * decimate_ratio))
+    else:
+        budget = 4 * max_dimension ** 2
+        if num_faces <= budget:
+            return stl_mesh
+        target = budget
+
+    try:
+        tm = trimesh.Trimesh(**trimesh.triangles.to_kwargs(stl_mesh.vectors))
+        simplified = tm.simplify_quadric_decimation(face_count=target)
+    except ImportError as e:
+        # Quadric decimation needs the fast_simplification backend
+        if decimate_ratio is not None:
+            print(f"Warning: cannot decimate ({e}); rendering the full mesh",
+                  file=sys.stderr)
+        return stl_mesh
+    except ValueError as e:
+        # Mesh unsuitable for decimation (degenerate, too few faces, ...)
+        if decimate_ratio is not None:
+            print(f"Warning: decimation failed ({e}); rendering the full mesh",
+                  file=sys.stderr)
+        return stl_mesh
+
+    data = np.zeros(len(simplified.faces), dtype=mesh.Mesh.dtype)
+    data['vectors'] = simplified.triangles
+    new_mesh = mesh.Mesh(data)
+    new_mesh.update_normals()
+    return new_mesh
+
+
+# Bucket sizes for the vectorized NumPy rasterizer: triangles whose pixel
+# bounding box fits an S×S tile are rasterized together in one broadcast.
+_NUMPY_RASTER_BUCKETS = (8, 16, 32, 64)
+# Cap on elements per broadcast tensor (K * S * S) to bound peak memory.
+_NUMPY_RASTER_CHUNK = 1 << 22
+
+
+def _rasterize_bucket_numpy(idx, S, px, py, z_view, face_rgb,
+                            bx0, bx1, by0, by1, color_buf, depth_buf):
+    """
+    Rasterize a bucket of triangles whose bboxes fit an S×S pixel tile.
+
+    Evaluates the edge functions for all triangles in the bucket with one
+    broadcast over a shared (K, S, S) grid, amortizing NumPy dispatch over
+    the whole bucket, then resolves depth with a single np.minimum.at
+    scatter followed by a color write for the winning samples.
+    """
+    H, W = depth_buf.shape
+    depth_flat = depth_buf.reshape(-1)
+    color_flat = color_buf.reshape(-1, color_buf.shape[2])
+
+    x0, y0 = px[idx, 0], py[idx, 0]
+    x1, y1 = px[idx, 1], py[idx, 1]
+    x2, y2 = px[idx, 2], py[idx, 2]
+
+    denom = (y1 - y2) * (x0 - x2) + (x2 - x1) * (y0 - y2)
+    ok = np.abs(denom) >= 0.5  # Degenerate / sub-pixel triangles drop out
+    if not np.any(ok):
+        return
+    idx = idx[ok]
+    x0, y0, x1, y1, x2, y2 = x0[ok], y0[ok], x1[ok], y1[ok], x2[ok], y2[ok]
+    tb_x0, tb_x1 = bx0[idx], bx1[idx]
+    tb_y0, tb_y1 = by0[idx], by1[idx]
+
+    inv_d = 1.0 / denom[ok]
+    a0 = (y1 - y2) * inv_d
+    b0 = (x2 - x1) * inv_d
+    a1 = (y2 - y0) * inv_d
+    b1 = (x0 - x2) * inv_d
+    w0_org = ((y1 - y2) * (tb_x0 - x2) + (x2 - x1) * (tb_y0 - y2)) * inv_d
+    w1_org = ((y2 - y0) * (tb_x0 - x2) + (x0 - x2) * (tb_y0 - y2)) * inv_d
+
+    inv_z = 1.0 / z_view[idx]  # (K, 3)
+
+    step = np.arange(S, dtype=np.float32)
+    row = step[None, None, :]   # x offsets within the tile
+    col = step[None, :, None]   # y offsets within the tile
+
+    # Chunk the bucket so the (K, S, S) temporaries stay bounded
+    chunk = max(1, _NUMPY_RASTER_CHUNK // (S * S))
+    for lo in range(0, len(idx), chunk):
+        sl = slice(lo, lo + chunk)
+        w0 = w0_org[sl, None, None] + a0[sl, None, None] * row + b0[sl, None, None] * col
+        w1 = w1_org[sl, None, None] + a1[sl, None, None] * row + b1[sl, None, None] * col
+        w2 = 1.0 - w0 - w1
+
+        istep = step.astype(np.int32)
+        xs = tb_x0[sl, None, None].astype(np.int32) + istep[None, None, :]
+        ys = tb_y0[sl, None, None].astype(np.int32) + istep[None, :, None]
+
+        inside = (
+            (w0 >= 0) & (w1 >= 0) & (w2 >= 0)
+            & (xs <= tb_x1[sl, None, None].astype(np.int32))
+            & (ys <= tb_y1[sl, None, None].astype(np.int32))
+        )
+        if not np.any(inside):
+            continue
+
+        # Perspective-correct depth: interpolate 1/z (linear in screen space)
+        inv_z_interp = (
+            w0 * inv_z[sl, 0, None, None]
+            + w1 * inv_z[sl, 1, None, None]
+            + w2 * inv_z[sl, 2, None, None]
+        )
+
+        tri = np.broadcast_to(idx[sl, None, None], inside.shape)[inside]
+        flat = (ys * np.int32(W) + xs)[inside]
+        z = (1.0 / inv_z_interp[inside]).astype(np.float32)
+
+        # Depth resolve: one scatter-min, then color the winning samples
+        np.minimum.at(depth_flat, flat, z)
+        won = z == depth_flat[flat]
+        flat_w = flat[won]
+        color_flat[flat_w, :3] = face_rgb[tri[won]]
+        color_flat[flat_w, 3] = 255
+
+
+def _rasterize_triangles_numpy(px, py, z_view, face_rgb, color_buf, depth_buf):
+    """
+    Pure-NumPy z-buffer rasterizer (fallback when numba is unavailable).
+
+    Triangles are grouped by projected bounding-box size and each group is
+    evaluated in a single fused broadcast (see _rasterize_bucket_numpy);
+    only triangles larger than the biggest bucket fall back to the
+    per-triangle loop.
+
+    Args:
+        px, py: (N, 3) float32 pixel coordinates per triangle vertex
+        z_view: (N, 3) float32 view-space depth per vertex
+        face_rgb: (N, 3) uint8 flat shading color per face
+        color_buf: (H, W, 4) uint8 RGBA output, written in place
+        depth_buf: (H, W) float32 z-buffer, written in place
+    """
+    H, W = depth_buf.shape
+    N = px.shape[0]
+    if N == 0:
+        return
+
+    # Clamped pixel bounding boxes for all triangles at once
+    bx0 = np.maximum(np.floor(px.min(axis=1)), 0).astype(np.float32)
+    bx1 = np.minimum(np.ceil(px.max(axis=1)), W - 1).astype(np.float32)
+    by0 = np.maximum(np.floor(py.min(axis=1)), 0).astype(np.float32)
+    by1 = np.minimum(np.ceil(py.max(axis=1)), H - 1).astype(np.float32)
+
+    visible = (bx1 >= bx0) & (by1 >= by0)
+    span = np.maximum(bx1 - bx0, by1 - by0) + 1
+
+    assigned = ~visible
+    for S in _NUMPY_RASTER_BUCKETS:
+        sel = ~assigned & (span <= S)
+        if np.any(sel):
+            _rasterize_bucket_numpy(np.nonzero(sel)[0], S, px, py, z_view,
+                                    face_rgb, bx0, bx1, by0, by1,
+                                    color_buf, depth_buf)
+            assigned |= sel
+
+    # Oversized triangles: per-triangle broadcast over their own bbox
+    for i in np.nonzero(~assigned)[0]:
+        vx, vy, vz = px[i], py[i], z_view[i]
+        tx0, tx1 = int(bx0[i]), int(bx1[i])
+        ty0, ty1 = int(by0[i]), int(by1[i])
+
+        x0, y0 = vx[0], vy[0]
+        x1, y1 = vx[1], vy[1]
+        x2, y2 = vx[2], vy[2]
+        denom = (y1 - y2) * (x0 - x2) + (x2 - x1) * (y0 - y2)
+        if abs(denom) < 0.5:
+            continue  # Degenerate / sub-pixel triangle
+
+        # Edge functions are affine: seed at the bbox corner and add the
+        # per-axis deltas via a broadcast outer sum (one 1D row + one 1D
+        # column) instead of evaluating the full expression per pixel.
+        inv_d = 1.0 / denom
+        a0 = (y1 - y2) * inv_d
+        b0 = (x2 - x1) * inv_d
+        a1 = (y2 - y0) * inv_d
+        b1 = (x0 - x2) * inv_d
+        w0_org = ((y1 - y2) * (tx0 - x2) + (x2 - x1) * (ty0 - y2)) * inv_d
+        w1_org = ((y2 - y0) * (tx0 - x2) + (x0 - x2) * (ty0 - y2)) * inv_d
+
+        dx = np.arange(tx1 - tx0 + 1, dtype=np.float32)[None, :]
+        dy = np.arange(ty1 - ty0 + 1, dtype=np.float32)[:, None]
+        w0 = w0_org + a0 * dx + b0 * dy
+        w1 = w1_org + a1 * dx + b1 * dy
+        w2 = 1.0 - w0 - w1
+
+        inside = (w0 >= 0) & (w1 >= 0) & (w2 >= 0)
+        if not np.any(inside):
+            continue
+
+        # Perspective-correct depth interpolation: interpolate 1/z (linear in screen space)
+        inv_z_interp = (w0 / vz[0] + w1 / vz[1] + w2 / vz[2])[inside]
+        z_interp = 1.0 / inv_z_interp
+        iy, ix = np.nonzero(inside)
+        ay = (iy + ty0).astype(np.int32)
+        ax = (ix + tx0).astype(np.int32)
+
+        # Write pixel only where this triangle is closer than what's there
+        closer = z_interp < depth_buf[ay, ax]
+        uy, ux = ay[closer], ax[closer]
+        depth_buf[uy, ux] = z_interp[closer]
+        color_buf[uy, ux, :3] = face_rgb[i]
+        color_buf[uy, ux, 3] = 255
+
+
+# Screen-tile edge length for the parallel rasterizer. Tiles never share
+# pixels, so tile-level parallelism needs no locks.
+_RASTER_TILE = 64
+
+
+if numba is not None:
+    @numba.njit(cache=True, fastmath=True)
+    def _raster_tri_clamped(i, px, py, z_view, face_rgb, color_buf, depth_buf,
+                            cx0, cx1, cy0, cy1):
+        """
+        Rasterize triangle i into the pixel rectangle [cx0..cx1]×[cy0..cy1].
+
+        Returns (fresh_pixels, max_z_written): the number of previously
+        empty pixels this triangle filled and the largest depth it stored
+        (0.0 when nothing was written), so callers can track tile coverage
+        for early-z triangle rejection.
+        """
+        fresh = 0
+        zmax = np.float32(0.0)
+
+        x0, y0, z0 = px[i, 0], py[i, 0], z_view[i, 0]
+        x1, y1, z1 = px[i, 1], py[i, 1], z_view[i, 1]
+        x2, y2, z2 = px[i, 2], py[i, 2], z_view[i, 2]
+
+        bx0 = max(cx0, int(min(x0, x1, x2)))
+        bx1 = min(cx1, int(np.ceil(max(x0, x1, x2))))
+        by0 = max(cy0, int(min(y0, y1, y2)))
+        by1 = min(cy1, int(np.ceil(max(y0, y1, y2))))
+        if bx0 > bx1 or by0 > by1:
+            return fresh, zmax
+
+        denom = (y1 - y2) * (x0 - x2) + (x2 - x1) * (y0 - y2)
+        if abs(denom) < 0.5:
+            return fresh, zmax  # Degenerate / sub-pixel triangle
+
+        # Edge functions are affine in screen space: per-pixel steps along
+        # x (a*) and y (b*), seeded once at the bbox corner.
+        inv_d = 1.0 / denom
+        a0 = (y1 - y2) * inv_d
+        b0 = (x2 - x1) * inv_d
+        a1 = (y2 - y0) * inv_d
+        b1 = (x0 - x2) * inv_d
+        a2 = -(a0 + a1)
+        b2 = -(b0 + b1)
+        w0_00 = ((y1 - y2) * (bx0 - x2) + (x2 - x1) * (by0 - y2)) * inv_d
+        w1_00 = ((y2 - y0) * (bx0 - x2) + (x0 - x2) * (by0 - y2)) * inv_d
+        w2_00 = 1.0 - w0_00 - w1_00
+
+        iz0 = 1.0 / z0
+        iz1 = 1.0 / z1
+        iz2 = 1.0 / z2
+
+        r, g, b = face_rgb[i, 0], face_rgb[i, 1], face_rgb[i, 2]
+
+        # Classify 8x8 blocks by their corner edge-function values: since
+        # each edge function is affine, its extrema over a block sit on
+        # corners, so a block is trivially inside (no per-pixel inside
+        # test) or trivially outside (skipped) from six compares.
+        B = 8
+        for ys in range(by0, by1 + 1, B):
+            ye = min(ys + B - 1, by1)
+            hspan = ye - ys
+            for xs in range(bx0, bx1 + 1, B):
+                xe = min(xs + B - 1, bx1)
+                wspan = xe - xs
+
+                e0 = w0_00 + a0 * (xs - bx0) + b0 * (ys - by0)
+                e1 = w1_00 + a1 * (xs - bx0) + b1 * (ys - by0)
+                e2 = w2_00 + a2 * (xs - bx0) + b2 * (ys - by0)
+
+                e0_lo = e0 + min(a0 * wspan, 0.0) + min(b0 * hspan, 0.0)
+                e0_hi = e0 + max(a0 * wspan, 0.0) + max(b0 * hspan, 0.0)
+                e1_lo = e1 + min(a1 * wspan, 0.0) + min(b1 * hspan, 0.0)
+                e1_hi = e1 + max(a1 * wspan, 0.0) + max(b1 * hspan, 0.0)
+                e2_lo = e2 + min(a2 * wspan, 0.0) + min(b2 * hspan, 0.0)
+                e2_hi = e2 + max(a2 * wspan, 0.0) + max(b2 * hspan, 0.0)
+
+                if e0_hi < 0 or e1_hi < 0 or e2_hi < 0:
+                    continue  # Block entirely outside one edge
+                full = e0_lo >= 0 and e1_lo >= 0 and e2_lo >= 0
+
+                for yy in range(ys, ye + 1):
+                    w0 = e0 + b0 * (yy - ys)
+                    w1 = e1 + b1 * (yy - ys)
+                    for xx in range(xs, xe + 1):
+                        if full or (w0 >= 0 and w1 >= 0 and 1.0 - w0 - w1 >= 0):
+                            # Perspective-correct: interpolate 1/z
+                            w2 = 1.0 - w0 - w1
+                            z = 1.0 / (w0 * iz0 + w1 * iz1 + w2 * iz2)
+                            if z < depth_buf[yy, xx]:
+                                if np.isinf(depth_buf[yy, xx]):
+                                    fresh += 1
+                                depth_buf[yy, xx] = z
+                                if z > zmax:
+                                    zmax = np.float32(z)
+                                color_buf[yy, xx, 0] = r
+                                color_buf[yy, xx, 1] = g
+                                color_buf[yy, xx, 2] = b
+                                color_buf[yy, xx, 3] = 255
+                        w0 += a0
+                        w1 += a1
+        return fresh, zmax
+
+    @numba.njit(cache=True, fastmath=True, parallel=True)
+    def _rasterize_triangles_jit(px, py, z_view, face_rgb, color_buf, depth_buf):
+        """
+        Tile-binned parallel z-buffer rasterizer.
+
+        Triangles are binned to every 64x64 screen tile their bounding box
+        touches, then tiles run in parallel; disjoint pixel ownership makes
+        the writes race-free. Bin order preserves triangle submission order.
+        """
+        H, W = depth_buf.shape
+        N = px.shape[0]
+        tile = _RASTER_TILE
+        tiles_x = (W + tile - 1) // tile
+        tiles_y = (H + tile - 1) // tile
+        n_tiles = tiles_x * tiles_y
+
+        # Pass 1: clamped pixel bbox per triangle + triangle count per tile
+        bbox = np.empty((N, 4), dtype=np.int32)
+        counts = np.zeros(n_tiles, dtype=np.int64)
+        for i in range(N):
+            bx0 = max(0, int(min(px[i, 0], px[i, 1], px[i, 2])))
+            bx1 = min(W - 1, int(np.ceil(max(px[i, 0], px[i, 1], px[i, 2]))))
+            by0 = max(0, int(min(py[i, 0], py[i, 1], py[i, 2])))
+            by1 = min(H - 1, int(np.ceil(max(py[i, 0], py[i, 1], py[i, 2]))))
+            if bx0 > bx1 or by0 > by1:
+                bbox[i, 0] = -1
+                continue
+            bbox[i, 0] = bx0 // tile
+            bbox[i, 1] = bx1 // tile
+            bbox[i, 2] = by0 // tile
+            bbox[i, 3] = by1 // tile
+            for ty in range(bbox[i, 2], bbox[i, 3] + 1):
+                for tx in range(bbox[i, 0], bbox[i, 1] + 1):
+                    counts[ty * tiles_x + tx] += 1
+
+        # Pass 2: bucket triangle indices per tile (CSR-style layout)
+        offsets = np.zeros(n_tiles + 1, dtype=np.int64)
+        for t in range(n_tiles):
+            offsets[t + 1] = offsets[t] + counts[t]
+        bins = np.empty(offsets[n_tiles], dtype=np.int64)
+        cursor = offsets[:n_tiles].copy()
+        for i in range(N):
+            if bbox[i, 0] < 0:
+                continue
+            for ty in range(bbox[i, 2], bbox[i, 3] + 1):
+                for tx in range(bbox[i, 0], bbox[i, 1] + 1):
+                    t = ty * tiles_x + tx
+                    bins[cursor[t]] = i
+                    cursor[t] += 1
+
+        # Pass 3: rasterize tiles in parallel
+        for t in numba.prange(n_tiles):
+            ty = t // tiles_x
+            tx = t % tiles_x
+            cx0 = tx * tile
+            cx1 = min(W - 1, cx0 + tile - 1)
+            cy0 = ty * tile
+            cy1 = min(H - 1, cy0 + tile - 1)
+            tile_area = (cx1 - cx0 + 1) * (cy1 - cy0 + 1)
+
+            # Once every pixel in the tile is covered, a triangle whose
+            # nearest vertex is behind the deepest write so far can never
+            # pass the depth test — skip it outright. zmax only ever
+            # overestimates the true tile maximum, so the skip is safe.
+            covered = 0
+            zmax = np.float32(0.0)
+            for k in range(offsets[t], offsets[t + 1]):
+                i = bins[k]
+                if covered >= tile_area:
+                    z_near_tri = min(z_view[i, 0], z_view[i, 1], z_view[i, 2])
+                    if z_near_tri > zmax:
+                        continue
+                fresh, zw = _raster_tri_clamped(i, px, py, z_view, face_rgb,
+                                                color_buf, depth_buf,
+                                                cx0, cx1, cy0, cy1)
+                covered += fresh
+                if zw > zmax:
+                    zmax = zw
+else:
+    _rasterize_triangles_jit = None
+
+
+def _rasterize_triangles(px, py, z_view, face_rgb, color_buf, depth_buf):
+    """Rasterize triangles into color/depth buffers, JIT-compiled when possible."""
+    if _rasterize_triangles_jit is not None:
+        _rasterize_triangles_jit(px, py, z_view, face_rgb, color_buf, depth_buf)
+    else:
+        _rasterize_triangles_numpy(px, py, z_view, face_rgb, color_buf, depth_buf)
+
+
+# Persistent raster buffers: batch renders at a fixed max_dimension hit
+# (nearly) the same buffer size every file, so keep the largest allocation
+# seen and hand out refilled slices instead of reallocating per render.
+_SCRATCH = {'color': None, 'depth': None}
+
+
+def _scratch_buffers(H, W):
+    """
+    Zeroed uint8 (H, W, 4) color and inf-filled float32 (H, W) depth buffers.
+
+    Backed by flat module-level arrays so the returned views are always
+    C-contiguous (the rasterizers index flat offsets and reshape).
+    """
+    n = H * W
+    color = _SCRATCH['color']
+    if color is None or color.size < n * 4:
+        _SCRATCH['color'] = np.empty(n * 4, dtype=np.uint8)
+        _SCRATCH['depth'] = np.empty(n, dtype=np.float32)
+    color = _SCRATCH['color'][:n * 4].reshape(H, W, 4)
+    depth = _SCRATCH['depth'][:n].reshape(H, W)
+    color.fill(0)
+    depth.fill(np.inf)
+    return color, depth
+
 
 def debug_mesh_info(stl_mesh, quiet=False):
-    """Print diagnostic info about the mesh geometry."""
+    """
+    Print diagnostic info about the mesh geometry.
+
+    The quiet guard must stay the very first statement: everything below
+    it copies and classifies the full normal array, which batch mode must
+    never pay for. (Batch callers additionally skip the call entirely.)
+    """
     if quiet:
         return
     min_b = stl_mesh.min_
@@ -35,15 +659,12 @@ def debug_mesh_info(stl_mesh, quiet=False):
     centroid = (min_b + max_b) / 2
     num_faces = len(stl_mesh.vectors)
 
-    # Classify face normals by dominant direction
-    normals = stl_mesh.normals.copy()
-    norms = np.linalg.norm(normals, axis=1, keepdims=True)
-    norms[norms == 0] = 1
-    normals /= norms
-
-    up = np.sum(normals[:, 2] > 0.9)
-    down = np.sum(normals[:, 2] < -0.9)
-    sideways = num_faces - up - down
+    # Classify face normals by dominant direction. Only the normalized Z
+    # component matters, and a single where + bincount counts all three
+    # categories in one pass over it.
+    nz = stl_mesh.normals[:, 2] / np.linalg.norm(stl_mesh.normals, axis=1).clip(1e-12)
+    cats = np.where(nz > 0.9, 2, np.where(nz < -0.9, 0, 1))
+    down, sideways, up = np.bincount(cats, minlength=3)
 
     print(f"Mesh info:")
     print(f"  Bounds: X[{min_b[0]:.1f}, {max_b[0]:.1f}] Y[{min_b[1]:.1f}, {max_b[1]:.1f}] Z[{min_b[2]:.1f}, {max_b[2]:.1f}]")
@@ -52,7 +673,46 @@ def debug_mesh_info(stl_mesh, quiet=False):
     print(f"  Faces: {num_faces} total — {up} up, {down} down, {sideways} side")
 
 
-def render_stl_to_png(stl_path, output_path, max_dimension=800, dpi=100, quiet=False, rotation=0):
+def _prepare_mesh(stl_mesh, rotation):
+    """
+    Shared render prolog: rotate, bound and shade a loaded mesh.
+
+    Applies the Z rotation in place, computes bounds (a single fresh pass
+    when rotated, the mesh's cached bounds otherwise), derives unit
+    normals from the rotated vertices and quantizes per-face flat-shading
+    colors to uint8. Both renderers start here, so rotation/shading fixes
+    apply to both paths once instead of diverging.
+
+    Returns (min_b, max_b, normals, face_rgb) with face_rgb (N, 3) uint8.
+    """
+    if rotation != 0:
+        v = stl_mesh.vectors
+        _rotate_xy_inplace(v, rotation)
+        # Bounds change under rotation; compute them here in one pass
+        # rather than invalidating numpy-stl's cache and paying its
+        # full-array rescan on the next min_/max_ access.
+        flat = v.reshape(-1, 3)
+        min_b = flat.min(axis=0)
+        max_b = flat.max(axis=0)
+    else:
+        min_b = stl_mesh.min_
+        max_b = stl_mesh.max_
+
+    # Normals derive from the rotated vertices (see _face_normals), so
+    # the stored STL normals are never rotated or trusted.
+    normals = _face_normals(stl_mesh.vectors)
+    diffuse = np.clip(normals.dot(_LIGHT_DIR), 0, 1)
+    brightness = _AMBIENT + (1.0 - _AMBIENT) * diffuse
+    # Round-to-nearest uint8 quantization: the output is an 8-bit PNG
+    # anyway, and uint8 colors are what the rasterizer and the PNG
+    # encoders consume directly.
+    face_rgb = (brightness[:, None] * (_BASE_COLOR * np.float32(255.0))
+                + np.float32(0.5)).astype(np.uint8)
+    return min_b, max_b, normals, face_rgb
+
+
+def render_stl_to_png(stl_path, output_path, max_dimension=800, dpi=100, quiet=False, rotation=0,
+                      figure=None, decimate_ratio=None):
     """
     Render an STL file to a PNG image with top-down 2D projection.
 
@@ -62,75 +722,42 @@ def render_stl_to_png(stl_path, output_path, max_dimension=800, dpi=100, quiet=F
         max_dimension: Maximum width or height in pixels (default: 800)
         dpi: Dots per inch for output image
         quiet: If True, suppress verbose output (for batch mode)
+        figure: Optional (fig, ax) tuple to render into (batch mode). The
+            axes are cleared and the figure resized per call; the caller
+            owns the figure and closes it once after the loop.
+        decimate_ratio: Optional face-count reduction ratio; None = auto
     """
     try:
-        # Load the STL file
-        stl_mesh = mesh.Mesh.from_file(stl_path)
+        # Load the STL file (cached across repeat renders of the same path)
+        stl_mesh = _load_mesh(stl_path)
+        stl_mesh = _maybe_decimate(stl_mesh, max_dimension, decimate_ratio)
 
         # Print diagnostic info
-        debug_mesh_info(stl_mesh, quiet=quiet)
-
-        # Apply user rotation around Z-axis if specified
-        if rotation != 0:
-            angle_rad = np.radians(rotation)
-            cos_a, sin_a = np.cos(angle_rad), np.sin(angle_rad)
-            # Rotate vertices in-place (numpy-stl uses structured arrays)
-            v = stl_mesh.vectors
-            x_all = v[:, :, 0].copy()
-            y_all = v[:, :, 1].copy()
-            v[:, :, 0] = cos_a * x_all - sin_a * y_all
-            v[:, :, 1] = sin_a * x_all + cos_a * y_all
-            # Rotate normals in-place
-            n = stl_mesh.normals
-            nx = n[:, 0].copy()
-            ny = n[:, 1].copy()
-            n[:, 0] = cos_a * nx - sin_a * ny
-            n[:, 1] = sin_a * nx + cos_a * ny
-            # Invalidate numpy-stl cached bounds
-            for attr in ('_min', '_max'):
-                if hasattr(stl_mesh, attr):
-                    delattr(stl_mesh, attr)
-
-        # Get mesh bounds
-        min_bounds = stl_mesh.min_
-        max_bounds = stl_mesh.max_
+        # Diagnostics are for interactive use only; batch mode (quiet=True)
+        # skips the call so the classification work never runs per file.
+        if not quiet:
+            debug_mesh_info(stl_mesh)
+
+        # Shared prolog: rotation, bounds, normals, uint8 shading colors
+        min_bounds, max_bounds, _, face_rgb = _prepare_mesh(stl_mesh, rotation)
 
         x_range = max_bounds[0] - min_bounds[0]
         y_range = max_bounds[1] - min_bounds[1]
 
-        # Sort faces by average Z (painter's algorithm: draw lowest first)
-        z_order = np.mean(stl_mesh.vectors[:, :, 2], axis=1)
+        # Sort faces by average Z (painter's algorithm: draw lowest first).
+        # Fused einsum reduction: one pass, no (N, 3) intermediate from np.mean.
+        z_order = np.einsum('ij->i', stl_mesh.vectors[:, :, 2]) * (1.0 / 3.0)
         sort_idx = np.argsort(z_order)
 
-        sorted_vectors = stl_mesh.vectors[sort_idx]
-        sorted_normals = stl_mesh.normals[sort_idx]
-
-        # Project to 2D: extract X,Y only
-        polygons = sorted_vectors[:, :, :2]  # (N, 3, 2) — triangles in XY
-
-        # Compute per-face shading from normals
-        normals = sorted_normals.copy()
-        norms = np.linalg.norm(normals, axis=1, keepdims=True)
-        norms[norms == 0] = 1
-        normals /= norms
-
-        # Light from upper-left at 45° elevation
-        el, az = np.radians(45), np.radians(225)
-        light_dir = np.array([
-            np.cos(el) * np.sin(az),
-            np.cos(el) * np.cos(az),
-            np.sin(el)
-        ])
-        light_dir /= np.linalg.norm(light_dir)
-
-        ambient = 0.3
-        diffuse = np.clip(np.dot(normals, light_dir), 0, 1)
-        brightness = ambient + (1 - ambient) * diffuse
+        # Widen to RGBA for matplotlib; faces are fully opaque
+        face_colors = np.empty((len(face_rgb), 4), dtype=np.uint8)
+        face_colors[:, :3] = face_rgb
+        face_colors[:, 3] = 255
 
-        base_color = np.array([0.7, 0.7, 0.75])
-        face_colors = brightness[:, np.newaxis] * base_color
-        # Add alpha channel (fully opaque faces)
-        face_colors = np.column_stack([face_colors, np.ones(len(face_colors))])
+        # Gather into painter's order: XY coordinates only ((N, 3, 2) instead
+        # of the full (N, 3, 3) vertex copy) plus the uint8 color table.
+        polygons = stl_mesh.vectors[:, :, :2][sort_idx]
+        face_colors = face_colors[sort_idx]
 
         # Compute figure size from model aspect ratio
         aspect_ratio = x_range / y_range if y_range > 0 else 1.0
@@ -141,19 +768,26 @@ def render_stl_to_png(stl_path, output_path, max_dimension=800, dpi=100, quiet=F
             fig_width = (max_dimension * aspect_ratio) / dpi
             fig_height = max_dimension / dpi
 
-        # Create 2D figure
-        fig, ax = plt.subplots(figsize=(fig_width, fig_height), dpi=dpi)
+        # Create the 2D figure, or recycle the caller's batch figure
+        if figure is not None:
+            fig, ax = figure
+            ax.cla()
+            fig.set_size_inches(fig_width, fig_height, forward=True)
+        else:
+            fig, ax = plt.subplots(figsize=(fig_width, fig_height), dpi=dpi)
 
         # Transparent background
         fig.patch.set_alpha(0)
         ax.patch.set_alpha(0)
         ax.set_axis_off()
 
-        # Render with PolyCollection
-        collection = PolyCollection(
-            polygons,
-            facecolors=face_colors,
-            edgecolors=face_colors,
+        # Render as compound paths: one Path per same-color run instead of
+        # one per triangle (see _polygons_to_run_paths)
+        paths, run_colors = _polygons_to_run_paths(polygons, face_colors)
+        collection = PathCollection(
+            paths,
+            facecolors=run_colors,
+            edgecolors=run_colors,
             linewidths=0.5,
         )
         ax.add_collection(collection)
@@ -166,12 +800,14 @@ def render_stl_to_png(stl_path, output_path, max_dimension=800, dpi=100, quiet=F
         ax.set_aspect('equal')
 
         # Remove all margins
-        plt.subplots_adjust(left=0, right=1, top=1, bottom=0)
+        fig.subplots_adjust(left=0, right=1, top=1, bottom=0)
 
-        # Save with transparency
-        plt.savefig(output_path, bbox_inches='tight', pad_inches=0,
-                    transparent=True, dpi=dpi)
-        plt.close()
+        # Save with transparency. No bbox_inches='tight': the axes already
+        # fill the whole figure (subplots_adjust above), and tight mode
+        # would render the figure a second time just to measure it.
+        fig.savefig(output_path, pad_inches=0, transparent=True, dpi=dpi)
+        if figure is None:
+            plt.close(fig)
 
         actual_width = int(fig_width * dpi)
         actual_height = int(fig_height * dpi)
@@ -189,7 +825,8 @@ def render_stl_to_png(stl_path, output_path, max_dimension=800, dpi=100, quiet=F
 
 
 def render_stl_to_png_perspective(stl_path, output_path, max_dimension=800, camera_tilt=22.5,
-                                   fov=45, dpi=100, quiet=False, rotation=0):
+                                   fov=45, dpi=100, quiet=False, rotation=0,
+                                   decimate_ratio=None):
     """
     Render an STL file to a PNG image with perspective projection.
 
@@ -206,66 +843,25 @@ def render_stl_to_png_perspective(stl_path, output_path, max_dimension=800, came
         dpi: Unused in z-buffer mode; kept for API compatibility
         quiet: If True, suppress verbose output
         rotation: Z-axis rotation in degrees (0, 90, 180, 270)
+        decimate_ratio: Optional face-count reduction ratio; None = auto
 
     Returns:
         True on success, False on failure
     """
     try:
-        import matplotlib
-        matplotlib.use('Agg')
-
-        stl_mesh = mesh.Mesh.from_file(stl_path)
-        debug_mesh_info(stl_mesh, quiet=quiet)
-
-        # Exact sin/cos for 90-degree rotation stops (avoids floating-point noise)
-        EXACT_ROTATIONS = {
-            0:   (1.0,  0.0),
-            90:  (0.0,  1.0),
-            180: (-1.0, 0.0),
-            270: (0.0, -1.0),
-        }
-
-        if rotation != 0:
-            key = rotation % 360
-            cos_a, sin_a = EXACT_ROTATIONS.get(
-                key, (np.cos(np.radians(rotation)), np.sin(np.radians(rotation)))
-            )
-            v = stl_mesh.vectors
-            x_all = v[:, :, 0].copy()
-            y_all = v[:, :, 1].copy()
-            v[:, :, 0] = cos_a * x_all - sin_a * y_all
-            v[:, :, 1] = sin_a * x_all + cos_a * y_all
-            n = stl_mesh.normals
-            nx = n[:, 0].copy()
-            ny = n[:, 1].copy()
-            n[:, 0] = cos_a * nx - sin_a * ny
-            n[:, 1] = sin_a * nx + cos_a * ny
-            for attr in ('_min', '_max'):
-                if hasattr(stl_mesh, attr):
-                    delattr(stl_mesh, attr)
+        stl_mesh = _load_mesh(stl_path)
+        stl_mesh = _maybe_decimate(stl_mesh, max_dimension, decimate_ratio)
+        # Diagnostics are for interactive use only; batch mode (quiet=True)
+        # skips the call so the classification work never runs per file.
+        if not quiet:
+            debug_mesh_info(stl_mesh)
 
-        min_b = stl_mesh.min_
-        max_b = stl_mesh.max_
+        # Shared prolog: rotation, bounds, normals, uint8 shading colors.
+        # Normals stay in play here for backface culling below.
+        min_b, max_b, normals, face_rgb = _prepare_mesh(stl_mesh, rotation)
         extents = max_b - min_b
         centroid = (min_b + max_b) / 2.0
 
-        # ── Per-face shading ──────────────────────────────────────────────────
-        normals = stl_mesh.normals.copy()
-        norms = np.linalg.norm(normals, axis=1, keepdims=True)
-        norms[norms == 0] = 1
-        normals /= norms
-
-        el_light, az_light = np.radians(45), np.radians(225)
-        light_dir = np.array([
-            np.cos(el_light) * np.sin(az_light),
-            np.cos(el_light) * np.cos(az_light),
-            np.sin(el_light),
-        ])
-        light_dir /= np.linalg.norm(light_dir)
-        brightness = 0.3 + 0.7 * np.clip(normals.dot(light_dir), 0, 1)
-        base_color = np.array([0.7, 0.7, 0.75], dtype=np.float32)
-        face_rgb = (brightness[:, None] * base_color).astype(np.float32)  # (N, 3)
-
         # ── Camera ───────────────────────────────────────────────────────────
         tilt_rad = np.radians(camera_tilt)
         scene_radius = np.linalg.norm(extents) * 0.5
@@ -287,15 +883,28 @@ def render_stl_to_png_perspective(stl_path, output_path, max_dimension=800, came
         cam_up = np.cross(right, forward)
 
         # ── Perspective projection → NDC ──────────────────────────────────────
+        # Camera math above runs in float64 for accuracy; cast the scalars
+        # and basis vectors to float32 once here so every bulk operation
+        # below stays in float32 (twice the SIMD lanes of float64, and no
+        # mixed-dtype temporaries from implicit upcasts).
         N = stl_mesh.vectors.shape[0]
-        vf = (stl_mesh.vectors.reshape(-1, 3) - cam_pos).astype(np.float32)
-
-        x_view = vf.dot(right.astype(np.float32))
-        y_view = vf.dot(cam_up.astype(np.float32))
-        z_view = vf.dot(forward.astype(np.float32))
-
-        f_focal = float(1.0 / np.tan(np.radians(fov) / 2))
-        z_safe = np.where(z_view > 0.01 * cam_dist, z_view, np.float32(0.01 * cam_dist))
+        cam_pos32 = cam_pos.astype(np.float32)
+        basis = np.stack((right, cam_up, forward)).astype(np.float32)
+
+        # astype copies, so the in-place subtract cannot touch the mesh
+        vf = stl_mesh.vectors.reshape(-1, 3).astype(np.float32)
+        vf -= cam_pos32
+
+        # One matmul against the stacked camera basis touches the vertex
+        # data once instead of three separate dot products (memory-bound)
+        view = vf @ basis.T
+        x_view = view[:, 0]
+        y_view = view[:, 1]
+        z_view = view[:, 2]
+
+        f_focal = np.float32(1.0 / np.tan(np.radians(fov) / 2))
+        z_near = np.float32(0.01 * cam_dist)
+        z_safe = np.where(z_view > z_near, z_view, z_near)
         x_ndc = (x_view / z_safe * f_focal).reshape(N, 3)
         y_ndc = (y_view / z_safe * f_focal).reshape(N, 3)
         z_view = z_view.reshape(N, 3)
@@ -322,62 +931,39 @@ def render_stl_to_png_perspective(stl_path, output_path, max_dimension=800, came
         px = ((x_ndc - xn_lo) / (xn_hi - xn_lo) * (W - 1)).astype(np.float32)
         py = ((yn_hi - y_ndc) / (yn_hi - yn_lo) * (H - 1)).astype(np.float32)
 
+        # ── Backface / near-plane culling ─────────────────────────────────────
+        # For closed solids roughly half of all faces point away from the
+        # camera and can never win the depth test; drop them (and anything
+        # at or behind the near plane) before the raster loop. Framing above
+        # deliberately uses every face so the image extent is unaffected.
+        facing = normals.dot(forward) < 0.0
+        in_front = z_view.min(axis=1) > z_near
+        keep = facing & in_front
+        px = px[keep]
+        py = py[keep]
+        z_view = z_view[keep]
+        face_rgb = face_rgb[keep]
+
+        # Front-to-back order maximizes early-z rejection: once a nearer
+        # triangle owns a pixel, every later triangle fails the depth test
+        # with a single compare instead of a full interpolate-and-store.
+        order = np.argsort(z_view.min(axis=1))
+        px = px[order]
+        py = py[order]
+        z_view = z_view[order]
+        face_rgb = face_rgb[order]
+
         # ── Software z-buffer rasterization ───────────────────────────────────
-        # color_buf: RGBA float32; alpha=0 → transparent background.
+        # color_buf: RGBA uint8; alpha=0 → transparent background.
         # depth_buf: view-space z per pixel; smaller z = closer to camera.
-        color_buf = np.zeros((H, W, 4), dtype=np.float32)
-        depth_buf = np.full((H, W), np.inf, dtype=np.float32)
-
-        for i in range(N):
-            vx = px[i]      # (3,) pixel x
-            vy = py[i]      # (3,) pixel y
-            vz = z_view[i]  # (3,) view-space depth per vertex
-
-            # Bounding box clipped to image extents
-            bx0 = max(0, int(vx.min()))
-            bx1 = min(W - 1, int(np.ceil(vx.max())))
-            by0 = max(0, int(vy.min()))
-            by1 = min(H - 1, int(np.ceil(vy.max())))
-            if bx0 > bx1 or by0 > by1:
-                continue
-
-            # Pixel grid within bounding box
-            gx, gy = np.meshgrid(
-                np.arange(bx0, bx1 + 1, dtype=np.float32),
-                np.arange(by0, by1 + 1, dtype=np.float32),
-            )
-
-            # Barycentric coordinates via edge equations
-            x0, y0 = vx[0], vy[0]
-            x1, y1 = vx[1], vy[1]
-            x2, y2 = vx[2], vy[2]
-            denom = (y1 - y2) * (x0 - x2) + (x2 - x1) * (y0 - y2)
-            if abs(denom) < 0.5:
-                continue  # Degenerate / sub-pixel triangle
-
-            inv_d = 1.0 / denom
-            w0 = ((y1 - y2) * (gx - x2) + (x2 - x1) * (gy - y2)) * inv_d
-            w1 = ((y2 - y0) * (gx - x2) + (x0 - x2) * (gy - y2)) * inv_d
-            w2 = 1.0 - w0 - w1
-
-            inside = (w0 >= 0) & (w1 >= 0) & (w2 >= 0)
-            if not np.any(inside):
-                continue
-
-            # Perspective-correct depth interpolation: interpolate 1/z (linear in screen space)
-            inv_z_interp = (w0 / vz[0] + w1 / vz[1] + w2 / vz[2])[inside]
-            z_interp = 1.0 / inv_z_interp
-            ay = gy[inside].astype(np.int32)
-            ax = gx[inside].astype(np.int32)
+        color_buf, depth_buf = _scratch_buffers(H, W)
 
-            # Write pixel only where this triangle is closer than what's there
-            closer = z_interp < depth_buf[ay, ax]
-            uy, ux = ay[closer], ax[closer]
-            depth_buf[uy, ux] = z_interp[closer]
-            color_buf[uy, ux, :3] = face_rgb[i]
-            color_buf[uy, ux, 3] = 1.0
+        _rasterize_triangles(px, py, z_view, face_rgb, color_buf, depth_buf)
 
-        plt.imsave(output_path, color_buf)
+        # Write the buffer straight through Pillow rather than plt.imsave:
+        # same pixels, but skips matplotlib's colormap machinery, and a low
+        # zlib level keeps encode time small for throwaway preview PNGs.
+        Image.fromarray(color_buf, mode='RGBA').save(output_path, compress_level=1)
 
         if not quiet:
             print(f"Successfully rendered {stl_path} to {output_path}")
@@ -396,6 +982,71 @@ def render_stl_to_png_perspective(stl_path, output_path, max_dimension=800, came
         return False
 
 
+_TRI_PATH_CODES = np.array(
+    [Path.MOVETO, Path.LINETO, Path.LINETO, Path.CLOSEPOLY], dtype=Path.code_type
+)
+
+
+def _polygons_to_run_paths(polygons, face_colors):
+    """
+    Merge runs of consecutive same-color triangles into compound Paths.
+
+    PolyCollection builds one Path object per triangle, which dominates
+    draw time for large meshes. Because face colors are quantized to uint8
+    and faces arrive depth-sorted, long runs share a color (bin floors,
+    flat tops); each run becomes a single multi-subpath Path with one
+    fill color. Run order preserves the painter's draw order exactly.
+
+    Returns (paths, colors) where colors is float RGBA in [0, 1].
+    """
+    n = len(polygons)
+    changed = np.any(face_colors[1:] != face_colors[:-1], axis=1)
+    starts = np.concatenate(([0], np.nonzero(changed)[0] + 1))
+    ends = np.concatenate((starts[1:], [n]))
+
+    paths = []
+    for s, e in zip(starts, ends):
+        tris = polygons[s:e]
+        k = e - s
+        verts = np.empty((k * 4, 2), dtype=np.float32)
+        verts[0::4] = tris[:, 0]
+        verts[1::4] = tris[:, 1]
+        verts[2::4] = tris[:, 2]
+        verts[3::4] = tris[:, 0]
+        paths.append(Path(verts, np.tile(_TRI_PATH_CODES, k)))
+
+    return paths, face_colors[starts] / 255.0
+
+
+def _render_batch_file(task, figure=None):
+    """
+    Render one STL from a batch task tuple (picklable for process pools).
+
+    figure is the sequential batch loop's persistent (fig, ax); process
+    pools call with the default None, since figures cannot cross process
+    boundaries.
+    """
+    (stl_file, output_path, use_perspective, size, camera_tilt, fov, dpi,
+     rotation, decimate_ratio) = task
+    if use_perspective:
+        return render_stl_to_png_perspective(
+            stl_file, output_path,
+            max_dimension=size,
+            camera_tilt=camera_tilt,
+            fov=fov,
+            dpi=dpi,
+            quiet=True,
+            rotation=rotation,
+            decimate_ratio=decimate_ratio
+        )
+    return render_stl_to_png(
+        stl_file, output_path,
+        max_dimension=size, dpi=dpi, quiet=True,
+        rotation=rotation, figure=figure,
+        decimate_ratio=decimate_ratio
+    )
+
+
 def main():
     parser = argparse.ArgumentParser(
         description='Render an STL file to a PNG image. '
@@ -426,9 +1077,22 @@ def main():
                        help='Field of view in degrees for perspective mode (default: 45)')
     parser.add_argument('--rotate', type=int, default=0, choices=[0, 90, 180, 270],
                        help='Additional Z-axis rotation in degrees (default: 0)')
+    parser.add_argument('--decimate-ratio', type=float, default=None,
+                       help='Reduce face count to this fraction before rendering '
+                            '(0-1; requires trimesh and fast-simplification). '
+                            'Default: automatic, only '
+                            'when the mesh has more faces than output pixels.')
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                       help='Number of worker processes for batch mode '
+                            '(default: 1; use 0 for all cores)')
 
     args = parser.parse_args()
 
+    if args.jobs == 0:
+        args.jobs = os.cpu_count() or 1
+    elif args.jobs < 0:
+        parser.error('--jobs must be >= 0')
+
     # Determine rendering mode (perspective is default)
     use_perspective = not args.orthographic
 
@@ -459,24 +1123,31 @@ def main():
         successes = 0
         failures = 0
 
-        for stl_file in stl_files:
-            output_path = os.path.splitext(stl_file)[0] + '.png'
-            if use_perspective:
-                success = render_stl_to_png_perspective(
-                    stl_file, output_path,
-                    max_dimension=args.size,
-                    camera_tilt=args.camera_tilt,
-                    fov=args.fov,
-                    dpi=args.dpi,
-                    quiet=True,
-                    rotation=args.rotate
-                )
-            else:
-                success = render_stl_to_png(
-                    stl_file, output_path,
-                    max_dimension=args.size, dpi=args.dpi, quiet=True,
-                    rotation=args.rotate
-                )
+        tasks = [
+            (stl_file, os.path.splitext(stl_file)[0] + '.png', use_perspective,
+             args.size, args.camera_tilt, args.fov, args.dpi, args.rotate,
+             args.decimate_ratio)
+            for stl_file in stl_files
+        ]
+
+        batch_figure = None
+        if args.jobs > 1:
+            # File-level parallelism: renders are independent, so a process
+            # pool scales to core count without any shared state.
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+                results = pool.map(_render_batch_file, tasks)
+                outcomes = zip(tasks, results)
+        else:
+            if not use_perspective:
+                # One figure for the whole batch: construction and backend
+                # attachment are paid once, each render clears and resizes.
+                side = args.size / args.dpi
+                batch_figure = plt.subplots(figsize=(side, side), dpi=args.dpi)
+            outcomes = ((task, _render_batch_file(task, batch_figure))
+                        for task in tasks)
+
+        for (stl_file, output_path, *_), success in outcomes:
             if success:
                 print(f'  Rendered {stl_file} -> {output_path}')
                 successes += 1
@@ -484,6 +1155,8 @@ def main():
                 print(f'  FAILED  {stl_file}', file=sys.stderr)
                 failures += 1
 
+        if batch_figure is not None:
+            plt.close(batch_figure[0])
         print(f'Done: {successes} succeeded, {failures} failed')
         sys.exit(0 if failures == 0 else 1)
 
@@ -500,13 +1173,15 @@ def main():
             camera_tilt=args.camera_tilt,
             fov=args.fov,
             dpi=args.dpi,
-            rotation=args.rotate
+            rotation=args.rotate,
+            decimate_ratio=args.decimate_ratio
         )
     else:
         success = render_stl_to_png(
             args.stl_file, output_path,
             max_dimension=args.size, dpi=args.dpi,
-            rotation=args.rotate
+            rotation=args.rotate,
+            decimate_ratio=args.decimate_ratio
         )
 
     sys.exit(0 if success else 1)
@@ -1,40 +1,47 @@
 import os
-import pytest
-from unittest.mock import MagicMock, patch
-
+import subprocess
+from types import SimpleNamespace
 
-class TestParseTimeStr:
-    def test_hours_minutes_seconds(self):
-        from slicer import _parse_time_str
-        assert _parse_time_str("1h 23m 45s") == 5025
+import pytest
 
-    def test_minutes_seconds(self):
-        from slicer import _parse_time_str
-        assert _parse_time_str("23m 45s") == 1425
+# Skip the whole file cleanly (instead of erroring every test) when the
+# module under test is not importable, e.g. running from the wrong cwd.
+slicer = pytest.importorskip("slicer")
 
-    def test_seconds_only(self):
-        from slicer import _parse_time_str
-        assert _parse_time_str("45s") == 45
+# Canned gcode headers for the fake slicer runs
+GCODE_OK = (
+    "; filament used [g] = 18.72\n"
+    "; estimated printing time (normal mode) = 1h 48m\n"
+)
+GCODE_CLEANUP = (
+    "; filament used [g] = 10.0\n"
+    "; estimated printing time (normal mode) = 5m\n"
+)
+GCODE_NO_FILAMENT = "; estimated printing time (normal mode) = 45m\n"
+GCODE_NO_TIME = "; filament used [g] = 5.0\n"
 
-    def test_hours_only(self):
-        from slicer import _parse_time_str
-        assert _parse_time_str("2h") == 7200
+# Prebuilt once; the timeout scenario just raises it
+TIMEOUT_EXC = subprocess.TimeoutExpired(cmd=[], timeout=120)
 
-    def test_empty_string_returns_none(self):
-        from slicer import _parse_time_str
-        assert _parse_time_str("") is None
 
-    def test_non_time_string_returns_none(self):
-        from slicer import _parse_time_str
-        assert _parse_time_str("not a time") is None
+class TestParseTimeStr:
+    @pytest.mark.parametrize("s,expected", [
+        ("1h 23m 45s", 5025),
+        ("23m 45s", 1425),
+        ("45s", 45),
+        ("2h", 7200),
+        ("", None),
+        ("not a time", None),
+    ])
+    def test_parse(self, s, expected):
+        assert slicer._parse_time_str(s) == expected
 
 
 class TestCleanupStaleTempFiles:
     def test_creates_dir_when_absent(self, tmp_path, monkeypatch):
         target = str(tmp_path / "orca-slice")
         monkeypatch.setattr("slicer.TEMP_DIR", target)
-        from slicer import cleanup_stale_temp_files
-        cleanup_stale_temp_files()
+        slicer.cleanup_stale_temp_files()
         assert os.path.isdir(target)
 
     def test_wipes_existing_files(self, tmp_path, monkeypatch):
@@ -42,181 +49,174 @@ class TestCleanupStaleTempFiles:
         target.mkdir()
         (target / "stale.gcode").write_text("old data")
         monkeypatch.setattr("slicer.TEMP_DIR", str(target))
-        from slicer import cleanup_stale_temp_files
-        cleanup_stale_temp_files()
-        assert os.path.isdir(str(target))
+        slicer.cleanup_stale_temp_files()
+        # iterdir raises if the directory is gone, so emptiness alone
+        # proves the dir was recreated and wiped
         assert list(target.iterdir()) == []
 
 
+@pytest.fixture(autouse=True)
+def _fake_which(monkeypatch):
+    """Every test sees orca-slicer as installed unless it overrides which."""
+    monkeypatch.setattr("slicer.shutil.which", lambda _exe: "/usr/bin/orca-slicer")
+
+
+@pytest.fixture
+def patched_slicer(monkeypatch):
+    """
+    Let the test swap in a fake subprocess.run; monkeypatch undoes it at
+    teardown. The stub targets slicer's own subprocess reference, so the
+    fake is scoped to the module under test.
+    """
+    def set_run(run):
+        monkeypatch.setattr("slicer.subprocess.run", run)
+
+    return set_run
+
+
+def make_fake_run(gcode, captured=None):
+    """
+    Build a subprocess.run stand-in that writes gcode to the path after
+    the -o flag. When captured is a list, the output path is appended so
+    tests can assert on cleanup.
+    """
+    data = gcode.encode()
+
+    def _run(cmd, **kwargs):
+        out_path = cmd[cmd.index("-o") + 1]
+        if captured is not None:
+            captured.append(out_path)
+        # Raw fd write: no TextIOWrapper/buffer stack for a few bytes
+        fd = os.open(out_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, data)
+        finally:
+            os.close(fd)
+        return SimpleNamespace(returncode=0)
+
+    return _run
+
+
+@pytest.fixture(scope="module")
+def stl_and_config(tmp_path_factory):
+    """
+    Shared STL + config pair. slice_model only os.path.exists-checks the
+    STL (the mocked subprocess never parses it), so an empty touched file
+    is enough.
+    """
+    d = tmp_path_factory.mktemp("slice-fixtures")
+    config = d / "config.json"
+    config.write_text("{}")
+    stl = d / "model.stl"
+    stl.touch()
+    return str(stl), str(config)
+
+
+# Each scenario arranges one way slice_model can fail and returns the
+# (stl, config) pair to call it with; the parametrized test below owns
+# the shared plumbing and the final None assertion.
+def _config_missing(monkeypatch, patched_slicer, files):
+    stl, config = files
+    return stl, os.path.join(os.path.dirname(config), "missing.json")
+
+
+def _stl_missing(monkeypatch, patched_slicer, files):
+    stl, config = files
+    return os.path.join(os.path.dirname(stl), "missing.stl"), config
+
+
+def _orca_not_on_path(monkeypatch, patched_slicer, files):
+    monkeypatch.setattr("slicer.shutil.which", lambda _: None)
+    return files
+
+
+def _nonzero_exit(monkeypatch, patched_slicer, files):
+    proc = SimpleNamespace(returncode=1, stderr="slicing error")
+    patched_slicer(lambda *a, **k: proc)
+    return files
+
+
+def _filament_line_missing(monkeypatch, patched_slicer, files):
+    patched_slicer(make_fake_run(GCODE_NO_FILAMENT))
+    return files
+
+
+def _time_line_missing(monkeypatch, patched_slicer, files):
+    patched_slicer(make_fake_run(GCODE_NO_TIME))
+    return files
+
+
+def _timeout(monkeypatch, patched_slicer, files):
+    def raise_timeout(*a, **k):
+        raise TIMEOUT_EXC
+
+    patched_slicer(raise_timeout)
+    return files
+
+
+RETURNS_NONE_SCENARIOS = [
+    _config_missing,
+    _stl_missing,
+    _orca_not_on_path,
+    _nonzero_exit,
+    _filament_line_missing,
+    _time_line_missing,
+    _timeout,
+]
+
+
+@pytest.fixture(scope="class")
+def _slice_temp_dir(tmp_path_factory):
+    """Point slicer.TEMP_DIR at one scratch directory per test class.
+
+    Plain monkeypatch is function-scoped, so the class-wide rebind goes
+    through a MonkeyPatch context manager directly.
+    """
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr("slicer.TEMP_DIR", str(tmp_path_factory.mktemp("temp-gcode")))
+        yield
+
+
+@pytest.mark.usefixtures("_slice_temp_dir")
 class TestSliceModel:
-    def test_returns_none_when_config_missing(self, tmp_path):
-        from slicer import slice_model
-        result = slice_model("/some/model.stl", str(tmp_path / "missing.json"))
-        assert result is None
-
-    def test_returns_none_when_stl_missing(self, tmp_path):
-        from slicer import slice_model
-        config = tmp_path / "config.json"
-        config.write_text("{}")
-        result = slice_model(str(tmp_path / "missing.stl"), str(config))
-        assert result is None
-
-    def test_returns_none_when_orca_not_on_path(self, tmp_path):
-        from slicer import slice_model
-        config = tmp_path / "config.json"
-        config.write_text("{}")
-        # Create a dummy STL so the stl_path check passes
-        stl = tmp_path / "model.stl"
-        stl.write_bytes(b"solid test\nendsolid test\n")
-        with patch("slicer.shutil.which", return_value=None):
-            result = slice_model(str(stl), str(config))
-        assert result is None
-
-    def test_returns_none_on_nonzero_exit(self, tmp_path):
-        from slicer import slice_model
-        config = tmp_path / "config.json"
-        config.write_text("{}")
-        stl = tmp_path / "model.stl"
-        stl.write_bytes(b"solid test\nendsolid test\n")
-        mock_proc = MagicMock(returncode=1, stderr="slicing error")
-        with patch("slicer.shutil.which", return_value="/usr/bin/orca-slicer"), \
-             patch("subprocess.run", return_value=mock_proc):
-            result = slice_model(str(stl), str(config))
-        assert result is None
-
-    def test_returns_dict_on_success(self, tmp_path, monkeypatch):
-        from slicer import slice_model
-        config = tmp_path / "config.json"
-        config.write_text("{}")
-        stl = tmp_path / "model.stl"
-        stl.write_bytes(b"solid test\nendsolid test\n")
-        monkeypatch.setattr("slicer.TEMP_DIR", str(tmp_path))
-
-        gcode = (
-            "; filament used [g] = 18.72\n"
-            "; estimated printing time (normal mode) = 1h 48m\n"
-        )
-
-        def fake_run(cmd, **kwargs):
-            out_path = cmd[cmd.index("-o") + 1]
-            with open(out_path, "w") as f:
-                f.write(gcode)
-            return MagicMock(returncode=0)
-
-        with patch("slicer.shutil.which", return_value="/usr/bin/orca-slicer"), \
-             patch("subprocess.run", side_effect=fake_run):
-            result = slice_model(str(stl), str(config))
+    """Guard-clause and failure paths — cheap, mostly no gcode I/O."""
 
-        assert result == {"filamentGrams": 18.72, "printTimeSeconds": 6480}
+    @pytest.mark.parametrize("scenario", RETURNS_NONE_SCENARIOS,
+                             ids=lambda f: f.__name__.lstrip("_"))
+    def test_returns_none(self, scenario, monkeypatch, patched_slicer,
+                          stl_and_config):
+        stl, config = scenario(monkeypatch, patched_slicer, stl_and_config)
+        assert slicer.slice_model(stl, config) is None
 
-    def test_returns_none_when_filament_line_missing(self, tmp_path, monkeypatch):
-        from slicer import slice_model
-        config = tmp_path / "config.json"
-        config.write_text("{}")
-        stl = tmp_path / "model.stl"
-        stl.write_bytes(b"solid test\nendsolid test\n")
-        monkeypatch.setattr("slicer.TEMP_DIR", str(tmp_path))
-
-        gcode = "; estimated printing time (normal mode) = 45m\n"
-
-        def fake_run(cmd, **kwargs):
-            out_path = cmd[cmd.index("-o") + 1]
-            with open(out_path, "w") as f:
-                f.write(gcode)
-            return MagicMock(returncode=0)
-
-        with patch("slicer.shutil.which", return_value="/usr/bin/orca-slicer"), \
-             patch("subprocess.run", side_effect=fake_run):
-            result = slice_model(str(stl), str(config))
-
-        assert result is None
-
-    def test_returns_none_when_time_line_missing(self, tmp_path, monkeypatch):
-        from slicer import slice_model
-        config = tmp_path / "config.json"
-        config.write_text("{}")
-        stl = tmp_path / "model.stl"
-        stl.write_bytes(b"solid test\nendsolid test\n")
-        monkeypatch.setattr("slicer.TEMP_DIR", str(tmp_path))
-
-        gcode = "; filament used [g] = 5.0\n"
-
-        def fake_run(cmd, **kwargs):
-            out_path = cmd[cmd.index("-o") + 1]
-            with open(out_path, "w") as f:
-                f.write(gcode)
-            return MagicMock(returncode=0)
-
-        with patch("slicer.shutil.which", return_value="/usr/bin/orca-slicer"), \
-             patch("subprocess.run", side_effect=fake_run):
-            result = slice_model(str(stl), str(config))
-
-        assert result is None
-
-    def test_cleans_up_temp_gcode_on_success(self, tmp_path, monkeypatch):
-        from slicer import slice_model
-        config = tmp_path / "config.json"
-        config.write_text("{}")
-        stl = tmp_path / "model.stl"
-        stl.write_bytes(b"solid test\nendsolid test\n")
-        monkeypatch.setattr("slicer.TEMP_DIR", str(tmp_path))
-
-        gcode = (
-            "; filament used [g] = 10.0\n"
-            "; estimated printing time (normal mode) = 5m\n"
-        )
-        written_path = []
 
-        def fake_run(cmd, **kwargs):
-            out_path = cmd[cmd.index("-o") + 1]
-            written_path.append(out_path)
-            with open(out_path, "w") as f:
-                f.write(gcode)
-            return MagicMock(returncode=0)
+@pytest.mark.slow
+@pytest.mark.usefixtures("_slice_temp_dir")
+class TestSliceModelPipeline:
+    """Full slice pipeline: gcode gets written, parsed and cleaned up."""
+
+    def test_returns_dict_on_success(self, patched_slicer, stl_and_config):
+        stl, config = stl_and_config
+        patched_slicer(make_fake_run(GCODE_OK))
+        result = slicer.slice_model(stl, config)
 
-        with patch("slicer.shutil.which", return_value="/usr/bin/orca-slicer"), \
-             patch("subprocess.run", side_effect=fake_run):
-            result = slice_model(str(stl), str(config))
+        assert result == {"filamentGrams": 18.72, "printTimeSeconds": 6480}
+
+    def test_cleans_up_temp_gcode_on_success(self, patched_slicer, stl_and_config):
+        stl, config = stl_and_config
+        written_path = []
+        patched_slicer(make_fake_run(GCODE_CLEANUP, captured=written_path))
+        result = slicer.slice_model(stl, config)
 
         assert result is not None
         assert written_path, "subprocess.run was not called"
         assert not os.path.exists(written_path[0]), "temp gcode was not cleaned up"
 
-    def test_cleans_up_temp_gcode_on_failure(self, tmp_path, monkeypatch):
-        from slicer import slice_model
-        config = tmp_path / "config.json"
-        config.write_text("{}")
-        stl = tmp_path / "model.stl"
-        stl.write_bytes(b"solid test\nendsolid test\n")
-        monkeypatch.setattr("slicer.TEMP_DIR", str(tmp_path))
-
+    def test_cleans_up_temp_gcode_on_failure(self, patched_slicer, stl_and_config):
+        stl, config = stl_and_config
         written_path = []
-
-        def fake_run(cmd, **kwargs):
-            out_path = cmd[cmd.index("-o") + 1]
-            written_path.append(out_path)
-            with open(out_path, "w") as f:
-                f.write("")  # empty gcode — parse will fail
-            return MagicMock(returncode=0)
-
-        with patch("slicer.shutil.which", return_value="/usr/bin/orca-slicer"), \
-             patch("subprocess.run", side_effect=fake_run):
-            slice_model(str(stl), str(config))
+        # empty gcode — parse will fail
+        patched_slicer(make_fake_run("", captured=written_path))
+        slicer.slice_model(stl, config)
 
         assert written_path, "subprocess.run was not called"
         assert not os.path.exists(written_path[0]), "temp gcode was not cleaned up on failure"
-
-    def test_returns_none_on_timeout(self, tmp_path, monkeypatch):
-        import subprocess as _subprocess
-        from slicer import slice_model
-        config = tmp_path / "config.json"
-        config.write_text("{}")
-        stl = tmp_path / "model.stl"
-        stl.write_bytes(b"solid test\nendsolid test\n")
-        monkeypatch.setattr("slicer.TEMP_DIR", str(tmp_path))
-
-        with patch("slicer.shutil.which", return_value="/usr/bin/orca-slicer"), \
-             patch("subprocess.run", side_effect=_subprocess.TimeoutExpired(cmd=[], timeout=120)):
-            result = slice_model(str(stl), str(config))
-
-        assert result is None